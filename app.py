@@ -1,11 +1,24 @@
 import streamlit as st
 import pandas as pd
 import json
+import argparse
+import numpy as np
+import plotly
 import plotly.graph_objects as go
 from io import StringIO
 import base64
+import hashlib
+import html
 import os
 import pickle
+import re
+import sys
+import tempfile
+import threading
+import uuid
+import weakref
+from itertools import count
+from concurrent.futures import ProcessPoolExecutor
 
 # Set page configuration
 st.set_page_config(
@@ -17,142 +30,227 @@ st.set_page_config(
 # File path for storing data
 DATA_FILE = "matrix_data.pickle"
 
+# Maximum number of competitors in a matrix
+MAX_COMPETITORS = 10
+
+# Directory for cached static reports, named by matrix content hash
+REPORT_DIR = "reports"
+# Separate directory for reports made from the app, which prunes it
+APP_REPORT_DIR = os.path.join(REPORT_DIR, "app")
+# Bump when the report template changes so cached reports are re-rendered
+REPORT_FORMAT = 1
+# Number of most recently used reports kept in APP_REPORT_DIR
+REPORT_CACHE_SIZE = 20
+
+# File path for storing dated matrix snapshots
+TREND_FILE = "trend_store.npz"
+
+# Default matrix shipped with the app: competitors with their totals, and
+# categories of (metric name, description, scores per competitor)
+DEFAULT_COMPETITORS = (
+    ("SiteOne.com", 44),
+    ("Grainger", 50),
+    ("Home Depot", 77),
+    ("PlantingTree.com", 62),
+    ("Fastenal", 34),
+    ("Heritage", 33),
+)
+
+DEFAULT_CATEGORIES = (
+    ("Site Navigation", (
+        ("Taxonomy Menu: Mega Menu", "Expandable navigation showing full product hierarchy and category breadth", (4, 4, 4, 3, 3, 3)),
+        ("Faceted Navigation", "Filter system using product attributes for refinement", (3, 4, 4, 4, 3, 4)),
+    )),
+    ("Product List Page", (
+        ("Product Descriptions", "Structured naming with brand, model, and key specifications", (3, 3, 4, 3, 2, 3)),
+        ("Thumbnail Images", "Quality and consistency of list view images", (3, 3, 4, 4, 2, 3)),
+    )),
+    ("Product Detail Images", (
+        ("Primary Image", "Presence and quality of main product image", (4, 4, 4, 4, 3, 3)),
+        ("Multiple Images", "Additional product views/angles available", (2, 3, 4, 4, 2, 2)),
+        ("Rich Content", "Interactive rotating product view", (0, 0, 0, 0, 0, 0)),
+        ("Lifestyle Images", "Photos showing product being used/installed", (0, 2, 4, 4, 0, 0)),
+    )),
+    ("Product Media", (
+        ("Product Videos", "Video content showing product features/use", (0, 0, 0, 0, 0, 0)),
+        ("Product PDF Assets", "Spec sheets, manuals, installation guides", (3, 2, 4, 3, 2, 1)),
+    )),
+    ("Product Content", (
+        ("Long Description/Feature Bullets", "Marketing descriptions and key product features", (3, 2, 4, 4, 3, 2)),
+        ("Specifications", "Technical product attributes and details", (3, 4, 4, 4, 3, 2)),
+        ("How to?", "Where/how to use the product", (3, 2, 4, 4, 2, 1)),
+        ("Product Recommendations/Substitutions", "Compatible products, replacement parts", (3, 3, 4, 3, 2, 2)),
+        ("Customer Reviews & Q&A", "Customer feedback and questions with answers", (2, 3, 4, 3, 1, 0)),
+        ("Projects/Inspirational/Collections", "Project ideas and inspirational content", (1, 2, 4, 3, 0, 0)),
+        ("Base/Variant – SUPER SKU", "Product variants and super SKU structure", (2, 3, 4, 2, 2, 1)),
+    )),
+)
+
+# Compact, immutable metadata records shared by all sessions
+class MetricMeta:
+    __slots__ = ("id", "name", "description", "__weakref__")
+
+    def __init__(self, metric_id, name, description):
+        object.__setattr__(self, "id", metric_id)
+        object.__setattr__(self, "name", sys.intern(name))
+        object.__setattr__(self, "description", sys.intern(description))
+
+    def __setattr__(self, attr, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+
+class CategoryMeta:
+    __slots__ = ("id", "name", "metrics", "__weakref__")
+
+    def __init__(self, category_id, name, metrics):
+        object.__setattr__(self, "id", category_id)
+        object.__setattr__(self, "name", sys.intern(name))
+        object.__setattr__(self, "metrics", tuple(metrics))
+
+    def __setattr__(self, attr, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+
+class MetadataTable:
+    """Interning table of metric and category metadata.
+
+    A session's layout is a tuple of the CategoryMeta records it uses, and
+    the session owns only a score grid with one row per metric, in layout
+    order, and one column per competitor. The table indexes records weakly,
+    so a record is freed once no session layout (or the default matrix)
+    refers to it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = count()
+        self._metric_index = weakref.WeakValueDictionary()
+        self._category_index = weakref.WeakValueDictionary()
+
+        default_categories = [
+            {
+                "name": name,
+                "metrics": [
+                    {"name": m_name, "description": m_desc, "scores": scores}
+                    for m_name, m_desc, scores in metrics
+                ]
+            }
+            for name, metrics in DEFAULT_CATEGORIES
+        ]
+        layout, grid = self.intern_categories(default_categories)
+        self.default_layout = layout
+        self.default_grid = tuple(tuple(row) for row in grid)
+
+    def __len__(self):
+        """Number of live metric and category records."""
+        return len(self._metric_index) + len(self._category_index)
+
+    def intern_metric(self, name, description):
+        key = (name, description)
+        with self._lock:
+            meta = self._metric_index.get(key)
+            if meta is None:
+                meta = MetricMeta(next(self._ids), name, description)
+                self._metric_index[key] = meta
+        return meta
+
+    def intern_category(self, name, metrics):
+        metrics = tuple(metrics)
+        key = (name, tuple(metric.id for metric in metrics))
+        with self._lock:
+            meta = self._category_index.get(key)
+            if meta is None:
+                meta = CategoryMeta(next(self._ids), name, metrics)
+                self._category_index[key] = meta
+        return meta
+
+    def intern_categories(self, categories):
+        """Split category dicts into a layout of category records and a score grid."""
+        layout = []
+        grid = []
+        for category in categories:
+            metrics = []
+            for metric in category["metrics"]:
+                metrics.append(self.intern_metric(metric["name"], metric.get("description", "")))
+                grid.append(list(metric["scores"]))
+            layout.append(self.intern_category(category["name"], metrics))
+        return tuple(layout), grid
+
+    def iter_rows(self, layout):
+        """Yield (category, [(row, metric), ...]) where row indexes the score grid."""
+        row = 0
+        for category in layout:
+            rows = []
+            for metric in category.metrics:
+                rows.append((row, metric))
+                row += 1
+            yield category, rows
+
+    def to_categories(self, layout, grid):
+        """Rebuild the category dicts used by the saved file and JSON export."""
+        return [
+            {
+                "name": category.name,
+                "metrics": [
+                    {"name": metric.name, "description": metric.description, "scores": grid[row]}
+                    for row, metric in rows
+                ]
+            }
+            for category, rows in self.iter_rows(layout)
+        ]
+
+    def default_matrix(self):
+        """Return a fresh (competitors, layout, grid) copy of the default matrix."""
+        competitors = ensure_competitor_ids([{"name": name, "score": score} for name, score in DEFAULT_COMPETITORS])
+        return competitors, self.default_layout, [list(row) for row in self.default_grid]
+
+
+# Shared metadata table, created once per server process
+@st.cache_resource
+def get_metadata_table():
+    return MetadataTable()
+
+metadata = get_metadata_table()
+
 # Load data function
+def competitor_id(name, occurrence=0):
+    """Stable ID for a competitor saved without one, derived from its name."""
+    return uuid.uuid5(uuid.NAMESPACE_URL, name if not occurrence else f"{name}#{occurrence}").hex
+
+def ensure_competitor_ids(competitors):
+    """Give every competitor an "id" that survives renames and moves.
+
+    Data saved or exported before IDs existed gets name-derived IDs, so the
+    same matrix always maps to the same trend series.
+    """
+    seen = {comp["id"] for comp in competitors if comp.get("id")}
+    for comp in competitors:
+        if not comp.get("id"):
+            occurrence = 0
+            while competitor_id(comp["name"], occurrence) in seen:
+                occurrence += 1
+            comp["id"] = competitor_id(comp["name"], occurrence)
+            seen.add(comp["id"])
+    return competitors
+
 def load_data():
     if os.path.exists(DATA_FILE):
         try:
             with open(DATA_FILE, 'rb') as f:
                 data = pickle.load(f)
-                return data.get('competitors', []), data.get('categories', [])
+                layout, grid = metadata.intern_categories(data.get('categories', []))
+                return ensure_competitor_ids(data.get('competitors', [])), layout, grid
         except Exception as e:
             st.warning(f"Error loading saved data: {e}")
     
     # Return default data if no saved data exists
-    return [
-        {"name": "SiteOne.com", "score": 44},
-        {"name": "Grainger", "score": 50},
-        {"name": "Home Depot", "score": 77},
-        {"name": "PlantingTree.com", "score": 62},
-        {"name": "Fastenal", "score": 34},
-        {"name": "Heritage", "score": 33}
-    ], [
-        {
-            "name": "Site Navigation",
-            "metrics": [
-                {
-                    "name": "Taxonomy Menu: Mega Menu",
-                    "description": "Expandable navigation showing full product hierarchy and category breadth",
-                    "scores": [4, 4, 4, 3, 3, 3]
-                },
-                {
-                    "name": "Faceted Navigation",
-                    "description": "Filter system using product attributes for refinement",
-                    "scores": [3, 4, 4, 4, 3, 4]
-                }
-            ]
-        },
-        {
-            "name": "Product List Page",
-            "metrics": [
-                {
-                    "name": "Product Descriptions",
-                    "description": "Structured naming with brand, model, and key specifications",
-                    "scores": [3, 3, 4, 3, 2, 3]
-                },
-                {
-                    "name": "Thumbnail Images",
-                    "description": "Quality and consistency of list view images",
-                    "scores": [3, 3, 4, 4, 2, 3]
-                }
-            ]
-        },
-        {
-            "name": "Product Detail Images",
-            "metrics": [
-                {
-                    "name": "Primary Image",
-                    "description": "Presence and quality of main product image",
-                    "scores": [4, 4, 4, 4, 3, 3]
-                },
-                {
-                    "name": "Multiple Images",
-                    "description": "Additional product views/angles available",
-                    "scores": [2, 3, 4, 4, 2, 2]
-                },
-                {
-                    "name": "Rich Content",
-                    "description": "Interactive rotating product view",
-                    "scores": [0, 0, 0, 0, 0, 0]
-                },
-                {
-                    "name": "Lifestyle Images",
-                    "description": "Photos showing product being used/installed",
-                    "scores": [0, 2, 4, 4, 0, 0]
-                }
-            ]
-        },
-        {
-            "name": "Product Media",
-            "metrics": [
-                {
-                    "name": "Product Videos",
-                    "description": "Video content showing product features/use",
-                    "scores": [0, 0, 0, 0, 0, 0]
-                },
-                {
-                    "name": "Product PDF Assets",
-                    "description": "Spec sheets, manuals, installation guides",
-                    "scores": [3, 2, 4, 3, 2, 1]
-                }
-            ]
-        },
-        {
-            "name": "Product Content",
-            "metrics": [
-                {
-                    "name": "Long Description/Feature Bullets",
-                    "description": "Marketing descriptions and key product features",
-                    "scores": [3, 2, 4, 4, 3, 2]
-                },
-                {
-                    "name": "Specifications",
-                    "description": "Technical product attributes and details",
-                    "scores": [3, 4, 4, 4, 3, 2]
-                },
-                {
-                    "name": "How to?",
-                    "description": "Where/how to use the product",
-                    "scores": [3, 2, 4, 4, 2, 1]
-                },
-                {
-                    "name": "Product Recommendations/Substitutions",
-                    "description": "Compatible products, replacement parts",
-                    "scores": [3, 3, 4, 3, 2, 2]
-                },
-                {
-                    "name": "Customer Reviews & Q&A",
-                    "description": "Customer feedback and questions with answers",
-                    "scores": [2, 3, 4, 3, 1, 0]
-                },
-                {
-                    "name": "Projects/Inspirational/Collections",
-                    "description": "Project ideas and inspirational content",
-                    "scores": [1, 2, 4, 3, 0, 0]
-                },
-                {
-                    "name": "Base/Variant – SUPER SKU",
-                    "description": "Product variants and super SKU structure",
-                    "scores": [2, 3, 4, 2, 2, 1]
-                }
-            ]
-        }
-    ]
+    return metadata.default_matrix()
 
 # Save data function
-def save_data(competitors, categories):
+def save_data(competitors, layout, score_grid):
     data = {
         'competitors': competitors,
-        'categories': categories
+        'categories': metadata.to_categories(layout, score_grid)
     }
     try:
         with open(DATA_FILE, 'wb') as f:
@@ -160,8 +258,8 @@ def save_data(competitors, categories):
     except Exception as e:
         st.warning(f"Error saving data: {e}")
 
-# Apply custom CSS
-st.markdown("""
+# Custom CSS, shared by the app and static reports
+APP_CSS = """
 <style>
     .main {
         padding: 1rem;
@@ -313,7 +411,10 @@ st.markdown("""
         margin-right: 10px;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Apply custom CSS
+st.markdown(APP_CSS, unsafe_allow_html=True)
 
 # Category icons (SVG paths)
 category_icons = {
@@ -324,22 +425,156 @@ category_icons = {
     'Product Content': '<svg width="20" height="20" viewBox="0 0 24 24" fill="currentColor"><path d="M14 2H6c-1.1 0-1.99.9-1.99 2L4 20c0 1.1.89 2 1.99 2H18c1.1 0 2-.9 2-2V8l-6-6zm2 16H8v-2h8v2zm0-4H8v-2h8v2zm-3-5V3.5L18.5 9H13z"/></svg>'
 }
 
+# Score legend, shared by the dashboard and static reports
+LEGEND_HTML = """
+        <div class="legend-container">
+            <div class="legend-item">
+                <div class="legend-circle score-5">5</div>
+                <span>World Class (5)</span>
+            </div>
+            <div class="legend-item">
+                <div class="legend-circle score-4">4</div>
+                <span>Very Good (4)</span>
+            </div>
+            <div class="legend-item">
+                <div class="legend-circle score-3">3</div>
+                <span>Good (3)</span>
+            </div>
+            <div class="legend-item">
+                <div class="legend-circle score-2">2</div>
+                <span>Basic (2)</span>
+            </div>
+            <div class="legend-item">
+                <div class="legend-circle score-1">1</div>
+                <span>None (1)</span>
+            </div>
+<div class="legend-item">
+                <div class="legend-circle score-0">0</div>
+                <span>Minimal/None (0)</span>
+            </div>
+        </div>
+"""
+
+# Function to render the competitor totals table
+def competitor_scores_html(competitors):
+    score_table = "<div class='matrix-container'><table class='score-table'><tr>"
+    
+    # Header row with Element/Website label
+    score_table += "<th class='element-column'>Element / Website</th>"
+    
+    # Create competitor headers with scores above names
+    for comp in competitors:
+        score_table += f"<th class='competitor-column'>{html.escape(comp['name'])}<br><div class='competitor-score'>Score: {comp['score']}</div></th>"
+        
+    score_table += "</tr>"
+    
+    # Close the table
+    score_table += "</table></div>"
+    return score_table
+
+# Function to render a category header with its icon
+def category_header_html(category):
+    icon_html = category_icons.get(category.name, "")
+    return f"<div class='accordion-header'><span class='accordion-icon'>{icon_html}</span> {html.escape(category.name)}</div>"
+
+# Function to render the metrics and scores table of one category
+def category_table_html(rows, score_grid, competitors):
+    table_html = "<div class='matrix-container'><table class='score-table'><tr>"
+    table_html += "<th class='element-column'>Element / Metric</th>"
+    
+    # Add competitor names as headers - just once per category
+    for comp in competitors:
+        table_html += f"<th class='competitor-column'>{html.escape(comp['name'])}</th>"
+    
+    table_html += "</tr>"
+    
+    # Add metric rows
+    for row, metric in rows:
+        table_html += "<tr>"
+        # Create a compact Element/Metric section with inline description
+        table_html += f"<td class='element-column'><div class='metric-name'>{html.escape(metric.name)}</div><div class='compact-description'>{html.escape(metric.description)}</div></td>"
+        
+        # Add scores
+        for i, score in enumerate(score_grid[row]):
+            if i < len(competitors):
+                table_html += f"<td class='competitor-column'><div class='score-circle score-{score}'>{score}</div></td>"
+        table_html += "</tr>"
+        
+    table_html += "</table></div>"
+    return table_html
+
+# Function to build the radar chart of category averages per competitor
+def radar_chart(competitors, layout, score_grid):
+    categories_df = []
+    
+    for category, rows in metadata.iter_rows(layout):
+        category_name = category.name
+        for comp_idx, competitor in enumerate(competitors):
+            comp_name = competitor["name"]
+            
+            # Calculate average score for this category
+            cat_scores = [score_grid[row][comp_idx] for row, _ in rows]
+            avg_score = sum(cat_scores) / len(cat_scores) if cat_scores else 0
+            
+            categories_df.append({
+                "Category": category_name,
+                "Competitor": comp_name,
+                "Score": round(avg_score, 1)
+            })
+    
+    cat_df = pd.DataFrame(categories_df, columns=["Category", "Competitor", "Score"])
+    
+    # Create radar chart using Plotly
+    fig = go.Figure()
+    
+    for competitor in cat_df["Competitor"].unique():
+        comp_data = cat_df[cat_df["Competitor"] == competitor]
+        
+        fig.add_trace(go.Scatterpolar(
+            r=comp_data["Score"].values,
+            theta=comp_data["Category"].values,
+            fill='toself',
+            name=competitor
+        ))
+    
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 5]
+            )
+        ),
+        title="Category Performance by Competitor",
+        showlegend=True
+    )
+    return fig
+
 # Initialize session state for storing data
-if 'competitors' not in st.session_state or 'categories' not in st.session_state:
-    competitors, categories = load_data()
+if 'score_grid' not in st.session_state:
+    competitors, layout, score_grid = load_data()
     st.session_state.competitors = competitors
-    st.session_state.categories = categories
+    st.session_state.layout = layout
+    st.session_state.score_grid = score_grid
+    st.session_state.matrix_version = 0
+    # Staged structural edits refer to positions in the previous matrix
+    st.session_state.staged_edits = []
+    st.session_state.structure_generation = st.session_state.get('structure_generation', 0) + 1
+
+# Function to record a change to the matrix so cached analytics are rebuilt
+def bump_matrix_version():
+    st.session_state.matrix_version = st.session_state.get('matrix_version', 0) + 1
 
 # Function to calculate total score for a competitor
-def calculate_total_score(competitor_index):
+def calculate_total_score(competitor_index, score_grid=None):
     total = 0
     count = 0
     
-    for category in st.session_state.categories:
-        for metric in category["metrics"]:
-            if competitor_index < len(metric["scores"]) and metric["scores"][competitor_index] is not None:
-                total += metric["scores"][competitor_index]
-                count += 1
+    if score_grid is None:
+        score_grid = st.session_state.score_grid
+    for scores in score_grid:
+        if competitor_index < len(scores) and scores[competitor_index] is not None:
+            total += scores[competitor_index]
+            count += 1
     
     return total if count > 0 else 0
 
@@ -348,7 +583,529 @@ def update_competitor_scores():
     for i, competitor in enumerate(st.session_state.competitors):
         competitor["score"] = calculate_total_score(i)
     # Save data after updating scores
-    save_data(st.session_state.competitors, st.session_state.categories)
+    save_data(st.session_state.competitors, st.session_state.layout, st.session_state.score_grid)
+
+# Function to build an editable plan of the matrix structure: competitor
+# columns as [name, source column] and categories as [name, metrics] with
+# metrics as [name, description, source row]; new entries have no source
+def structure_plan(competitors, layout):
+    columns = [[comp["name"], i] for i, comp in enumerate(competitors)]
+    categories = [
+        [category.name, [[metric.name, metric.description, row] for row, metric in rows]]
+        for category, rows in metadata.iter_rows(layout)
+    ]
+    return columns, categories
+
+# Functions to validate staged edits
+def _check_position(items, index, what):
+    if not 0 <= index < len(items):
+        raise ValueError(f"No {what} at position {index + 1}")
+
+def _check_name(name):
+    if not name.strip():
+        raise ValueError("Name cannot be empty")
+
+# Function to apply one staged structural edit to a plan, in place
+def apply_structure_edit(columns, categories, edit):
+    """Apply edit to the plan and return a short description of it.
+
+    Positions refer to the plan as left by the previous edits. Raises
+    ValueError if the edit is not valid for the current plan.
+    """
+    op, args = edit[0], edit[1:]
+    if op == "add_competitor":
+        _check_name(args[0])
+        if len(columns) >= MAX_COMPETITORS:
+            raise ValueError(f"Maximum of {MAX_COMPETITORS} competitors reached")
+        columns.append([args[0], None])
+        return f"Add competitor {args[0]}"
+    if op == "remove_competitor":
+        _check_position(columns, args[0], "competitor")
+        if len(columns) <= 1:
+            raise ValueError("At least one competitor is required")
+        name, _ = columns.pop(args[0])
+        return f"Remove competitor {name}"
+    if op == "rename_competitor":
+        _check_position(columns, args[0], "competitor")
+        _check_name(args[1])
+        old_name = columns[args[0]][0]
+        columns[args[0]][0] = args[1]
+        return f"Rename competitor {old_name} to {args[1]}"
+    if op == "move_competitor":
+        _check_position(columns, args[0], "competitor")
+        _check_position(columns, args[1], "competitor")
+        column = columns.pop(args[0])
+        columns.insert(args[1], column)
+        return f"Move competitor {column[0]} to position {args[1] + 1}"
+
+    if op == "add_category":
+        _check_name(args[0])
+        categories.append([args[0], []])
+        return f"Add category {args[0]}"
+    if op == "remove_category":
+        _check_position(categories, args[0], "category")
+        name, _ = categories.pop(args[0])
+        return f"Remove category {name}"
+    if op == "rename_category":
+        _check_position(categories, args[0], "category")
+        _check_name(args[1])
+        old_name = categories[args[0]][0]
+        categories[args[0]][0] = args[1]
+        return f"Rename category {old_name} to {args[1]}"
+    if op == "move_category":
+        _check_position(categories, args[0], "category")
+        _check_position(categories, args[1], "category")
+        category = categories.pop(args[0])
+        categories.insert(args[1], category)
+        return f"Move category {category[0]} to position {args[1] + 1}"
+
+    if op in ("add_metric", "remove_metric", "rename_metric", "move_metric"):
+        _check_position(categories, args[0], "category")
+        category_name, metrics = categories[args[0]]
+        if op == "add_metric":
+            _check_name(args[1])
+            metrics.append([args[1], args[2], None])
+            return f"Add metric {args[1]} to {category_name}"
+        _check_position(metrics, args[1], "metric")
+        if op == "remove_metric":
+            name = metrics.pop(args[1])[0]
+            return f"Remove metric {name} from {category_name}"
+        if op == "rename_metric":
+            _check_name(args[2])
+            old_name = metrics[args[1]][0]
+            metrics[args[1]][0:2] = [args[2], args[3]]
+            if old_name == args[2]:
+                return f"Update description of metric {old_name} in {category_name}"
+            return f"Rename metric {old_name} to {args[2]} in {category_name}"
+        _check_position(metrics, args[2], "metric")
+        metric = metrics.pop(args[1])
+        metrics.insert(args[2], metric)
+        return f"Move metric {metric[0]} to position {args[2] + 1} in {category_name}"
+
+    raise ValueError(f"Unknown edit: {op}")
+
+# Function to apply staged structural edits as one transformation of the matrix
+def apply_structure_edits(competitors, layout, score_grid, edits):
+    """Return the (competitors, layout, score_grid) that result from edits.
+
+    The edits only rearrange the plan; the new score grid is then gathered
+    from the old one in a single pass, with new cells defaulting to 1.
+    """
+    columns, categories = structure_plan(competitors, layout)
+    for edit in edits:
+        apply_structure_edit(columns, categories, edit)
+    
+    sources = [source for _, source in columns]
+    new_competitors = [
+        {
+            "id": competitors[source]["id"] if source is not None else uuid.uuid4().hex,
+            "name": name,
+            "score": competitors[source]["score"] if source is not None else 0
+        }
+        for name, source in columns
+    ]
+    new_layout = []
+    new_grid = []
+    for category_name, metrics in categories:
+        metric_metas = []
+        for name, description, row in metrics:
+            metric_metas.append(metadata.intern_metric(name, description))
+            old_scores = score_grid[row] if row is not None else ()
+            new_grid.append([
+                old_scores[source] if source is not None and source < len(old_scores) else 1
+                for source in sources
+            ])
+        new_layout.append(metadata.intern_category(category_name, metric_metas))
+    return new_competitors, tuple(new_layout), new_grid
+
+# Function to replay edits onto a fresh plan of the session's matrix; edits
+# that no longer apply are skipped, or raise ValueError when strict
+def replay_edits(edits, strict=False):
+    columns, categories = structure_plan(st.session_state.competitors, st.session_state.layout)
+    descriptions = []
+    applied = []
+    for edit in edits:
+        try:
+            descriptions.append(apply_structure_edit(columns, categories, edit))
+        except ValueError:
+            if strict:
+                raise
+            continue
+        applied.append(edit)
+    return columns, categories, descriptions, applied
+
+# Function to get the structure plan with all staged edits applied
+def staged_plan():
+    edits = st.session_state.get('staged_edits', [])
+    columns, categories, descriptions, applied = replay_edits(edits)
+    if len(applied) != len(edits):
+        st.session_state.staged_edits = applied
+        bump_structure_generation()
+        st.warning(f"Dropped {len(edits) - len(applied)} staged change(s) that no longer apply")
+    return columns, categories, descriptions
+
+# Function to check whether a rename changes the item it targets
+def _rename_changes(columns, categories, edit):
+    op, args = edit[0], edit[1:]
+    try:
+        if op == "rename_competitor":
+            return columns[args[0]][0] != args[1]
+        if op == "rename_category":
+            return categories[args[0]][0] != args[1]
+        return categories[args[0]][1][args[1]][:2] != [args[2], args[3]]
+    except IndexError:
+        # Left for apply_structure_edit to report
+        return True
+
+# Function to stage a structural edit after checking it against the plan
+def stage_edit(plan, edit):
+    edits = list(st.session_state.get('staged_edits', []))
+    renaming = edit[0].startswith("rename_")
+    try:
+        if renaming:
+            # A rename directly after one of the same item replaces it, so the
+            # description starts from the original name
+            target = edit[:3] if edit[0] == "rename_metric" else edit[:2]
+            if edits and edits[-1][:len(target)] == target:
+                edits.pop()
+            columns, categories, _, _ = replay_edits(edits, strict=True)
+            if _rename_changes(columns, categories, edit):
+                edits.append(edit)
+        else:
+            edits.append(edit)
+        new_plan = replay_edits(edits, strict=True)[:3]
+    except ValueError as e:
+        st.error(str(e))
+        return False
+    st.session_state.staged_edits = edits
+    for current, new in zip(plan, new_plan):
+        current[:] = new
+    # Edits other than renames shift positions, so widgets keyed by position
+    # must be recreated
+    if not renaming:
+        bump_structure_generation()
+    return True
+
+# Function to start a new generation of position-keyed structure widgets
+def bump_structure_generation():
+    st.session_state.structure_generation = st.session_state.get('structure_generation', 0) + 1
+
+# Function to drop all staged edits, e.g. when the matrix is replaced
+def discard_staged_edits():
+    st.session_state.staged_edits = []
+    bump_structure_generation()
+
+# Function to commit all staged edits with a single write
+def commit_staged_edits():
+    competitors, layout, score_grid = apply_structure_edits(
+        st.session_state.competitors, st.session_state.layout, st.session_state.score_grid,
+        st.session_state.get('staged_edits', [])
+    )
+    st.session_state.competitors = competitors
+    st.session_state.layout = layout
+    st.session_state.score_grid = score_grid
+    discard_staged_edits()
+    # Score widgets are keyed by position, which the edits may have changed
+    for key in [key for key in st.session_state if re.fullmatch(r"score_\d+_\d+_\d+", str(key))]:
+        del st.session_state[key]
+    bump_matrix_version()
+    save_data(st.session_state.competitors, st.session_state.layout, st.session_state.score_grid)
+
+# Function to convert the score grid to a metrics x competitors float array
+def score_array(score_grid, n_competitors):
+    try:
+        scores = np.array(score_grid, dtype=float).reshape(len(score_grid), -1)
+        if scores.shape[1] == n_competitors:
+            return scores
+    except (TypeError, ValueError):
+        pass
+    # Ragged rows or missing scores: pad with NaN
+    scores = np.full((len(score_grid), n_competitors), np.nan)
+    for row, values in enumerate(score_grid):
+        values = [np.nan if v is None else v for v in values[:n_competitors]]
+        scores[row, :len(values)] = values
+    return scores
+
+# Function to get one competitor's scores as a float array (NaN if missing)
+def score_column(score_grid, competitor_index):
+    return np.array([
+        row[competitor_index] if competitor_index < len(row) and row[competitor_index] is not None else np.nan
+        for row in score_grid
+    ], dtype=float)
+
+# Function to compute the competitive-gap analytics for a matrix
+def compute_analytics(competitors, layout, score_grid):
+    """Compute gap, category and similarity analytics over the whole score grid.
+
+    Returns a dict of arrays and DataFrames keyed by view; all views derive
+    from one metrics x competitors array built in a single pass. Only
+    per-competitor or per-category summaries are kept: pairwise gaps and a
+    competitor's gaps to the leader are cheap slices computed when shown.
+    """
+    comp_names = [c["name"] for c in competitors]
+    categories = []
+    metric_rows = []
+    row_category = []
+    for cat_pos, (category, rows) in enumerate(metadata.iter_rows(layout)):
+        categories.append(category.name)
+        for row, metric in rows:
+            metric_rows.append((category.name, metric.name))
+            row_category.append(cat_pos)
+
+    scores = score_array(score_grid, len(comp_names))
+    row_category = np.array(row_category, dtype=int)
+    valid = ~np.isnan(scores)
+    filled = np.where(valid, scores, 0.0)
+
+    # Totals and category averages (categories x competitors)
+    totals = filled.sum(axis=0)
+    membership = np.zeros((len(categories), len(metric_rows)))
+    membership[row_category, np.arange(len(metric_rows))] = 1.0
+    cat_sums = membership @ filled
+    cat_counts = membership @ valid
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cat_avgs = cat_sums / cat_counts
+
+    # Best and worst category per competitor
+    ranked = np.where(np.isnan(cat_avgs), -np.inf, cat_avgs)
+    best = ranked.argmax(axis=0) if categories else np.zeros(len(comp_names), dtype=int)
+    ranked = np.where(np.isnan(cat_avgs), np.inf, cat_avgs)
+    worst = ranked.argmin(axis=0) if categories else np.zeros(len(comp_names), dtype=int)
+    extremes = pd.DataFrame({
+        "Competitor": comp_names,
+        "Total": totals,
+        "Best Category": [categories[i] if categories else "" for i in best],
+        "Best Avg": cat_avgs[best, np.arange(len(comp_names))] if categories else np.nan,
+        "Worst Category": [categories[i] if categories else "" for i in worst],
+        "Worst Avg": cat_avgs[worst, np.arange(len(comp_names))] if categories else np.nan,
+    })
+
+    # Gap to the per-metric leader for every competitor (metrics x competitors)
+    if len(metric_rows) and len(comp_names):
+        leader = np.nanmax(np.where(valid, scores, -np.inf), axis=1)
+        leader_idx = np.where(valid, scores, -np.inf).argmax(axis=1)
+    else:
+        leader = np.zeros(len(metric_rows))
+        leader_idx = np.zeros(len(metric_rows), dtype=int)
+
+    # Score profiles relative to the field, compared by cosine similarity
+    with np.errstate(invalid="ignore"):
+        metric_means = np.nanmean(scores, axis=1, keepdims=True) if len(comp_names) else np.zeros((len(metric_rows), 1))
+    profiles = np.where(valid, scores - metric_means, 0.0).T
+    norms = np.linalg.norm(profiles, axis=1, keepdims=True)
+    unit = profiles / np.where(norms == 0, 1.0, norms)
+    similarity = unit @ unit.T
+
+    return {
+        "competitors": comp_names,
+        "categories": categories,
+        "metrics": metric_rows,
+        "totals": totals,
+        "category_averages": cat_avgs,
+        "extremes": extremes,
+        "leader": leader,
+        "leader_idx": leader_idx,
+        "profiles": unit,
+        "similarity": similarity,
+        "clusters": {},
+    }
+
+# Function to group competitors with similar score profiles (k-means)
+def cluster_competitors(profiles, n_clusters, iterations=50):
+    n = len(profiles)
+    n_clusters = max(1, min(n_clusters, n))
+    if n == 0:
+        return np.zeros(0, dtype=int)
+    # Deterministic farthest-point initialization
+    centers = [0]
+    dist = ((profiles - profiles[0]) ** 2).sum(axis=1)
+    for _ in range(1, n_clusters):
+        centers.append(int(dist.argmax()))
+        dist = np.minimum(dist, ((profiles - profiles[centers[-1]]) ** 2).sum(axis=1))
+    centroids = profiles[centers]
+    labels = np.zeros(n, dtype=int)
+    for iteration in range(iterations):
+        distances = (profiles ** 2).sum(axis=1)[:, None] - 2 * profiles @ centroids.T + (centroids ** 2).sum(axis=1)[None, :]
+        new_labels = distances.argmin(axis=1)
+        if iteration and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        counts = np.bincount(labels, minlength=n_clusters)[:, None]
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, profiles)
+        centroids = np.where(counts > 0, sums / np.maximum(counts, 1), centroids)
+    return labels
+
+# Function to get analytics for the current matrix, cached on its version
+def get_analytics():
+    cached = st.session_state.get('analytics_cache')
+    if cached is None or cached[0] != st.session_state.matrix_version:
+        analytics = compute_analytics(st.session_state.competitors, st.session_state.layout, st.session_state.score_grid)
+        cached = (st.session_state.matrix_version, analytics)
+        st.session_state.analytics_cache = cached
+    return cached[1]
+
+# Function to draw a labelled gap/similarity heatmap
+def heatmap_figure(values, labels, title, colorscale="RdYlGn", zmid=0):
+    fig = go.Figure(go.Heatmap(z=values, x=labels, y=labels, colorscale=colorscale, zmid=zmid))
+    fig.update_layout(title=title, height=max(400, 20 * len(labels)), yaxis=dict(autorange="reversed"))
+    return fig
+
+# Dated matrix snapshots for periodic benchmarking
+class TrendData:
+    """Immutable set of dated matrix snapshots.
+
+    All snapshots live in one date x metric x competitor float array, so
+    trend queries are slices and reductions over it. Metrics are keyed by
+    (category, metric name), so renaming a category or metric starts a new
+    series. Competitors are keyed by their stable "id", so renames and moves
+    keep their history; `competitors` holds the name from the latest
+    snapshot each one appears in. NaN marks a metric or competitor missing
+    from a snapshot.
+    """
+
+    FIELDS = ("dates", "metric_categories", "metric_names", "competitor_ids", "competitors", "scores")
+    __slots__ = FIELDS
+
+    def __init__(self, dates, metric_categories, metric_names, competitor_ids, competitors, scores):
+        for field, value in zip(self.FIELDS, (dates, metric_categories, metric_names, competitor_ids, competitors, scores)):
+            value = np.asarray(value)
+            value.flags.writeable = False
+            object.__setattr__(self, field, value)
+
+    def __setattr__(self, attr, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    @classmethod
+    def empty(cls):
+        return cls(
+            np.array([], dtype="datetime64[D]"),
+            np.array([], dtype=str),
+            np.array([], dtype=str),
+            np.array([], dtype=str),
+            np.array([], dtype=str),
+            np.empty((0, 0, 0), dtype=np.float32)
+        )
+
+    def with_snapshot(self, date, competitors, layout, score_grid):
+        """Return a copy with the matrix stored as the snapshot for date,
+        replacing any existing one; axes grow for new metrics and competitors."""
+        date = np.datetime64(date, "D")
+        ids = [comp["id"] for comp in competitors]
+        keys = [(category.name, metric.name) for category, rows in metadata.iter_rows(layout) for _, metric in rows]
+        snapshot = score_array(score_grid, len(ids))
+
+        metric_index = {key: i for i, key in enumerate(zip(self.metric_categories.tolist(), self.metric_names.tolist()))}
+        for key in keys:
+            metric_index.setdefault(key, len(metric_index))
+        comp_index = {comp_id: i for i, comp_id in enumerate(self.competitor_ids.tolist())}
+        for comp_id in ids:
+            comp_index.setdefault(comp_id, len(comp_index))
+
+        pos = int(np.searchsorted(self.dates, date))
+        replace = pos < len(self.dates) and self.dates[pos] == date
+        dates = self.dates if replace else np.insert(self.dates, pos, date)
+        old_slots = np.arange(len(dates)) if replace else np.delete(np.arange(len(dates)), pos)
+
+        # Show each competitor under its name in the newest snapshot it is in
+        comp_names = self.competitors.tolist() + [None] * (len(comp_index) - len(self.competitors))
+        latest = not len(self.dates) or date >= self.dates[-1]
+        for comp in competitors:
+            i = comp_index[comp["id"]]
+            if latest or comp_names[i] is None:
+                comp_names[i] = comp["name"]
+
+        scores = np.full((len(dates), len(metric_index), len(comp_index)), np.nan, dtype=np.float32)
+        scores[old_slots, :self.scores.shape[1], :self.scores.shape[2]] = self.scores
+        scores[pos] = np.nan
+        scores[pos][np.ix_([metric_index[key] for key in keys], [comp_index[comp_id] for comp_id in ids])] = snapshot
+
+        return TrendData(
+            dates,
+            np.array([key[0] for key in metric_index], dtype=str),
+            np.array([key[1] for key in metric_index], dtype=str),
+            np.array(list(comp_index), dtype=str),
+            np.array(comp_names, dtype=str),
+            scores
+        )
+
+    def categories(self):
+        return list(dict.fromkeys(self.metric_categories.tolist()))
+
+    def totals(self):
+        """Total score per snapshot and competitor (dates x competitors)."""
+        present = ~np.isnan(self.scores).all(axis=1)
+        return np.where(present, np.nansum(self.scores, axis=1), np.nan)
+
+    def category_averages(self, category):
+        """Average score in one category per snapshot and competitor."""
+        block = self.scores[:, self.metric_categories == category, :]
+        counts = (~np.isnan(block)).sum(axis=1)
+        return np.where(counts > 0, np.nansum(block, axis=1) / np.maximum(counts, 1), np.nan)
+
+    @staticmethod
+    def deltas(values, lag=1):
+        """Change in values (dates x competitors) over the previous lag snapshots."""
+        changes = np.full(values.shape, np.nan)
+        if 0 < lag < len(values):
+            changes[lag:] = values[lag:] - values[:-lag]
+        return changes
+
+
+class TrendStore:
+    """Persistent holder of the current TrendData.
+
+    Readers take `data` once and query that object; `record` builds a new
+    TrendData, saves it, and only then publishes it with one assignment.
+    """
+
+    def __init__(self, path=TREND_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self.data = TrendData.empty()
+        if os.path.exists(path):
+            try:
+                with np.load(path, allow_pickle=False) as saved:
+                    fields = {field: saved[field] for field in saved.files}
+                    if "competitor_ids" not in fields:
+                        # Stores recorded before competitor IDs keyed competitors by name
+                        fields["competitor_ids"] = [competitor_id(name) for name in fields["competitors"].tolist()]
+                    self.data = TrendData(**{field: fields[field] for field in TrendData.FIELDS})
+            except Exception as e:
+                st.warning(f"Error loading trend data: {e}")
+
+    def save(self, data):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, **{field: getattr(data, field) for field in TrendData.FIELDS})
+        os.replace(tmp_path, self.path)
+
+    def record(self, date, competitors, layout, score_grid):
+        """Record the matrix as the snapshot for date; returns True if saved."""
+        with self._lock:
+            data = self.data.with_snapshot(date, competitors, layout, score_grid)
+            try:
+                self.save(data)
+            except Exception as e:
+                st.error(f"Error saving trend data: {e}")
+                return False
+            self.data = data
+        return True
+
+
+# Trend store shared by all sessions, loaded once per server process
+@st.cache_resource
+def get_trend_store():
+    return TrendStore()
+
+# Function to draw one line per competitor over snapshot dates
+def trend_figure(dates, values, competitors, title):
+    fig = go.Figure()
+    for comp_idx, competitor in enumerate(competitors):
+        if not np.isnan(values[:, comp_idx]).all():
+            fig.add_trace(go.Scatter(x=dates, y=values[:, comp_idx], mode="lines+markers", name=competitor, connectgaps=True))
+    fig.update_layout(title=title, showlegend=True)
+    return fig
 
 # Download functions
 def get_download_link(data, filename, text):
@@ -357,56 +1114,162 @@ def get_download_link(data, filename, text):
     href = f'<a href="data:application/json;base64,{b64}" download="{filename}">{text}</a>'
     return href
 
+# Function to load a saved matrix file (pickle or exported JSON)
+def load_matrix_file(path):
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    else:
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+    layout, score_grid = metadata.intern_categories(data.get('categories', []))
+    return data.get('competitors', []), layout, score_grid
+
+# Function to compute the content address of a matrix report
+def report_digest(competitors, layout, score_grid):
+    content = json.dumps({
+        "format": REPORT_FORMAT,
+        "plotly": plotly.__version__,
+        "competitors": [c["name"] for c in competitors],
+        "categories": metadata.to_categories(layout, score_grid)
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+# Plotly's JS bundle, read once per process and embedded inline in reports
+@st.cache_resource
+def get_plotly_js():
+    from plotly.offline import get_plotlyjs
+    return get_plotlyjs()
+
+# Function to render the dashboard as a self-contained static HTML page
+def render_report_html(competitors, layout, score_grid):
+    competitors = [
+        {"name": comp["name"], "score": calculate_total_score(i, score_grid)}
+        for i, comp in enumerate(competitors)
+    ]
+    parts = [
+        "<!DOCTYPE html>",
+        "<html><head><meta charset='utf-8'>",
+        "<title>Product Content Analysis Matrix</title>",
+        f"<script type='text/javascript'>{get_plotly_js()}</script>",
+        APP_CSS,
+        "<style>body { font-family: sans-serif; color: #31333f; }</style>",
+        "</head><body><div class='main'>",
+        "<h1>Product Content Analysis Matrix</h1>",
+        LEGEND_HTML,
+        "<h3>Competitor Scores</h3>",
+        competitor_scores_html(competitors),
+        "<h3>Detailed Matrix View</h3>"
+    ]
+    for category, rows in metadata.iter_rows(layout):
+        parts.append(category_header_html(category))
+        parts.append(category_table_html(rows, score_grid, competitors))
+    fig = radar_chart(competitors, layout, score_grid)
+    parts.append(fig.to_html(full_html=False, include_plotlyjs=False))
+    parts.append("</div></body></html>")
+    return "\n".join(parts)
+
+# Function to get the cached report for a matrix, rendering it only if its
+# content has not been rendered before; with keep set, only the keep most
+# recently used reports are left in report_dir
+def get_report(competitors, layout, score_grid, report_dir=REPORT_DIR, keep=None):
+    digest = report_digest(competitors, layout, score_grid)
+    path = os.path.join(report_dir, f"matrix-{digest}.html")
+    try:
+        # Mark as recently used
+        os.utime(path)
+    except FileNotFoundError:
+        # Not rendered yet, or pruned by another session: render to a unique
+        # temp file so concurrent sessions never share one
+        os.makedirs(report_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=report_dir, prefix=".matrix-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(render_report_html(competitors, layout, score_grid))
+            # mkstemp creates the file private to this user; reports are for sharing
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    if keep is not None:
+        prune_reports(report_dir, keep)
+    return path
+
+# Function to remove all but the keep most recently used reports
+def prune_reports(report_dir, keep):
+    reports = []
+    for entry in os.scandir(report_dir):
+        if entry.name.startswith("matrix-") and entry.name.endswith(".html"):
+            try:
+                reports.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                pass
+    reports.sort(reverse=True)
+    for _, path in reports[keep:]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+# Function to build the report for one saved matrix file
+def build_report_file(matrix_path, report_dir=REPORT_DIR):
+    competitors, layout, score_grid = load_matrix_file(matrix_path)
+    return get_report(competitors, layout, score_grid, report_dir)
+
+# Function to build reports for many saved matrix files in parallel
+def build_reports(matrix_paths, report_dir=REPORT_DIR, workers=None):
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {path: executor.submit(build_report_file, path, report_dir) for path in matrix_paths}
+        for path, future in futures.items():
+            try:
+                results[path] = future.result()
+            except Exception as e:
+                results[path] = e
+    return results
+
+# Command-line report mode: python app.py report [--out DIR] [--workers N] FILE...
+def report_cli(argv):
+    parser = argparse.ArgumentParser(prog="app.py report", description="Build static HTML reports for saved matrices.")
+    parser.add_argument("matrices", nargs="*", default=[DATA_FILE], help="saved .pickle or exported .json matrix files")
+    parser.add_argument("--out", default=REPORT_DIR, help="report cache directory")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    args = parser.parse_args(argv)
+    
+    failed = False
+    for matrix_path, result in build_reports(args.matrices, args.out, args.workers).items():
+        if isinstance(result, Exception):
+            print(f"{matrix_path}: error: {result}", file=sys.stderr)
+            failed = True
+        else:
+            print(f"{matrix_path} -> {result}")
+    return 1 if failed else 0
+
 # Main app layout
 def main():
     st.title("Product Content Analysis Matrix")
     
     # Create tabs
-    tab1, tab2 = st.tabs(["Dashboard", "Data Editor"])
+    tab1, tab2, tab3, tab4 = st.tabs(["Dashboard", "Data Editor", "Analytics", "Trends"])
     
     with tab1:
         # Condensed Legend in a single row
-        st.markdown("""
-        <div class="legend-container">
-            <div class="legend-item">
-                <div class="legend-circle score-5">5</div>
-                <span>World Class (5)</span>
-            </div>
-            <div class="legend-item">
-                <div class="legend-circle score-4">4</div>
-                <span>Very Good (4)</span>
-            </div>
-            <div class="legend-item">
-                <div class="legend-circle score-3">3</div>
-                <span>Good (3)</span>
-            </div>
-            <div class="legend-item">
-                <div class="legend-circle score-2">2</div>
-                <span>Basic (2)</span>
-            </div>
-            <div class="legend-item">
-                <div class="legend-circle score-1">1</div>
-                <span>None (1)</span>
-            </div>
-<div class="legend-item">
-                <div class="legend-circle score-0">0</div>
-                <span>Minimal/None (0)</span>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(LEGEND_HTML, unsafe_allow_html=True)
         
         # Convert old scores (0,2,3,4) to new scale (1,2,3,4,5)
         if "score_updated" not in st.session_state:
-            for cat in st.session_state.categories:
-                for met in cat["metrics"]:
-                    for i, score in enumerate(met["scores"]):
-                        if score == 0:
-                            met["scores"][i] = 1
-                        elif score == 4:
-                            met["scores"][i] = 5
+            for scores in st.session_state.score_grid:
+                for i, score in enumerate(scores):
+                    if score == 0:
+                        scores[i] = 1
+                    elif score == 4:
+                        scores[i] = 5
             st.session_state.score_updated = True
+            bump_matrix_version()
             # Save data after updating scores
-            save_data(st.session_state.competitors, st.session_state.categories)
+            save_data(st.session_state.competitors, st.session_state.layout, st.session_state.score_grid)
         
         # Update scores
         update_competitor_scores()
@@ -415,108 +1278,147 @@ def main():
         st.markdown("<h3>Competitor Scores</h3>", unsafe_allow_html=True)
         
         # Create a table with scores above names like in the reference image
-        score_table = "<div class='matrix-container'><table class='score-table'><tr>"
-        
-        # Header row with Element/Website label
-        score_table += "<th class='element-column'>Element / Website</th>"
-        
-        # Create competitor headers with scores above names
-        for comp in st.session_state.competitors:
-            score_table += f"<th class='competitor-column'>{comp['name']}<br><div class='competitor-score'>Score: {comp['score']}</div></th>"
-            
-        score_table += "</tr>"
-        
-        # Close the table
-        score_table += "</table></div>"
-        
-        # Display the table
-        st.markdown(score_table, unsafe_allow_html=True)
+        st.markdown(competitor_scores_html(st.session_state.competitors), unsafe_allow_html=True)
         
         # Detailed Matrix View with icons
         st.markdown("<h3>Detailed Matrix View</h3>", unsafe_allow_html=True)
         
-        for category in st.session_state.categories:
-            # Add icon to category header
-            icon_html = category_icons.get(category["name"], "")
-            st.markdown(f"<div class='accordion-header'><span class='accordion-icon'>{icon_html}</span> {category['name']}</div>", unsafe_allow_html=True)
-            
-            # Create a table for metrics and scores
-            table_html = "<div class='matrix-container'><table class='score-table'><tr>"
-            table_html += "<th class='element-column'>Element / Metric</th>"
-            
-            # Add competitor names as headers - just once per category
-            for comp in st.session_state.competitors:
-                table_html += f"<th class='competitor-column'>{comp['name']}</th>"
-            
-            table_html += "</tr>"
-            
-            # Add metric rows
-            for metric in category["metrics"]:
-                table_html += "<tr>"
-                # Create a compact Element/Metric section with inline description
-                table_html += f"<td class='element-column'><div class='metric-name'>{metric['name']}</div><div class='compact-description'>{metric['description']}</div></td>"
-                
-                # Add scores
-                for i, score in enumerate(metric["scores"]):
-                    if i < len(st.session_state.competitors):
-                        table_html += f"<td class='competitor-column'><div class='score-circle score-{score}'>{score}</div></td>"
-                table_html += "</tr>"
-                
-            table_html += "</table></div>"
-            st.markdown(table_html, unsafe_allow_html=True)
+        for category, rows in metadata.iter_rows(st.session_state.layout):
+            st.markdown(category_header_html(category), unsafe_allow_html=True)
+            st.markdown(category_table_html(rows, st.session_state.score_grid, st.session_state.competitors), unsafe_allow_html=True)
     
     with tab2:
         st.header("Manage Competitors")
         
+        # Structural edits are staged against a preview plan and applied together
+        plan = staged_plan()
+        columns, categories, descriptions = plan
+        stage_key = st.session_state.get('structure_generation', 0)
+        
         # Edit existing competitors
-        for i, competitor in enumerate(st.session_state.competitors):
-            cols = st.columns([3, 1])
+        for i, (name, _) in enumerate(columns):
+            cols = st.columns([3, 1, 1, 1])
             with cols[0]:
-                new_name = st.text_input(f"Competitor {i+1}", competitor["name"], key=f"comp_{i}")
-                if new_name != competitor["name"]:
-                    st.session_state.competitors[i]["name"] = new_name
-                    # Save after changing name
-                    save_data(st.session_state.competitors, st.session_state.categories)
+                new_name = st.text_input(f"Competitor {i+1}", name, key=f"comp_{stage_key}_{i}")
+                if new_name != name:
+                    stage_edit(plan, ("rename_competitor", i, new_name))
             with cols[1]:
-                if st.button("Remove", key=f"remove_{i}") and len(st.session_state.competitors) > 1:
-                    st.session_state.competitors.pop(i)
-                    # Remove scores for this competitor
-                    for category in st.session_state.categories:
-                        for metric in category["metrics"]:
-                            if i < len(metric["scores"]):
-                                metric["scores"].pop(i)
-                    # Save after removing competitor
-                    save_data(st.session_state.competitors, st.session_state.categories)
-                    st.rerun()
+                if st.button("Up", key=f"comp_up_{stage_key}_{i}", disabled=i == 0):
+                    if stage_edit(plan, ("move_competitor", i, i - 1)):
+                        st.rerun()
+            with cols[2]:
+                if st.button("Down", key=f"comp_down_{stage_key}_{i}", disabled=i == len(columns) - 1):
+                    if stage_edit(plan, ("move_competitor", i, i + 1)):
+                        st.rerun()
+            with cols[3]:
+                if st.button("Remove", key=f"remove_{stage_key}_{i}"):
+                    if stage_edit(plan, ("remove_competitor", i)):
+                        st.rerun()
         
         # Add new competitor
         st.subheader("Add New Competitor")
         new_comp_cols = st.columns([3, 1])
         with new_comp_cols[0]:
-            new_competitor = st.text_input("New competitor name")
+            new_competitor = st.text_input("New competitor name", key=f"new_competitor_{stage_key}")
         with new_comp_cols[1]:
             if st.button("Add Competitor") and new_competitor.strip():
-                if len(st.session_state.competitors) < 10:
-                    st.session_state.competitors.append({"name": new_competitor, "score": 0})
-                    # Add empty score slot for each metric
-                    for category in st.session_state.categories:
-                        for metric in category["metrics"]:
-                            metric["scores"].append(1)  # Default to 1 (None) instead of 0
-                    # Save after adding competitor
-                    save_data(st.session_state.competitors, st.session_state.categories)
+                if stage_edit(plan, ("add_competitor", new_competitor)):
+                    st.rerun()
+        
+        # Categories and metrics
+        st.header("Manage Categories and Metrics")
+        category_cols = st.columns([3, 1])
+        with category_cols[0]:
+            new_category = st.text_input("New category name", key=f"new_category_{stage_key}")
+        with category_cols[1]:
+            if st.button("Add Category") and new_category.strip():
+                if stage_edit(plan, ("add_category", new_category)):
+                    st.session_state.struct_category_next = len(categories) - 1
+                    st.rerun()
+        
+        if categories:
+            # Keep the picker on the same category when edits move or remove categories
+            selected = st.session_state.pop('struct_category_next', st.session_state.get('struct_category', 0))
+            st.session_state.struct_category = min(selected, len(categories) - 1)
+            category_idx = st.selectbox("Category", range(len(categories)), format_func=lambda c: categories[c][0], key="struct_category")
+            category_name, metrics = categories[category_idx]
+            cols = st.columns([3, 1, 1, 1])
+            with cols[0]:
+                renamed = st.text_input("Category name", category_name, key=f"category_name_{stage_key}_{category_idx}")
+                if renamed != category_name:
+                    stage_edit(plan, ("rename_category", category_idx, renamed))
+            with cols[1]:
+                if st.button("Up", key=f"category_up_{stage_key}", disabled=category_idx == 0):
+                    if stage_edit(plan, ("move_category", category_idx, category_idx - 1)):
+                        st.session_state.struct_category_next = category_idx - 1
+                        st.rerun()
+            with cols[2]:
+                if st.button("Down", key=f"category_down_{stage_key}", disabled=category_idx == len(categories) - 1):
+                    if stage_edit(plan, ("move_category", category_idx, category_idx + 1)):
+                        st.session_state.struct_category_next = category_idx + 1
+                        st.rerun()
+            with cols[3]:
+                if st.button("Remove", key=f"category_remove_{stage_key}"):
+                    if stage_edit(plan, ("remove_category", category_idx)):
+                        st.rerun()
+            
+            for metric_idx, (metric_name, description, _) in enumerate(metrics):
+                cols = st.columns([2, 3, 1, 1, 1])
+                with cols[0]:
+                    renamed = st.text_input(f"Metric {metric_idx+1}", metric_name, key=f"metric_name_{stage_key}_{category_idx}_{metric_idx}")
+                with cols[1]:
+                    redescribed = st.text_input("Description", description, key=f"metric_description_{stage_key}_{category_idx}_{metric_idx}")
+                if (renamed, redescribed) != (metric_name, description):
+                    stage_edit(plan, ("rename_metric", category_idx, metric_idx, renamed, redescribed))
+                with cols[2]:
+                    if st.button("Up", key=f"metric_up_{stage_key}_{category_idx}_{metric_idx}", disabled=metric_idx == 0):
+                        if stage_edit(plan, ("move_metric", category_idx, metric_idx, metric_idx - 1)):
+                            st.rerun()
+                with cols[3]:
+                    if st.button("Down", key=f"metric_down_{stage_key}_{category_idx}_{metric_idx}", disabled=metric_idx == len(metrics) - 1):
+                        if stage_edit(plan, ("move_metric", category_idx, metric_idx, metric_idx + 1)):
+                            st.rerun()
+                with cols[4]:
+                    if st.button("Remove", key=f"metric_remove_{stage_key}_{category_idx}_{metric_idx}"):
+                        if stage_edit(plan, ("remove_metric", category_idx, metric_idx)):
+                            st.rerun()
+            
+            metric_cols = st.columns([2, 3, 1])
+            with metric_cols[0]:
+                new_metric = st.text_input("New metric name", key=f"new_metric_{stage_key}")
+            with metric_cols[1]:
+                new_description = st.text_input("Description", key=f"new_metric_description_{stage_key}")
+            with metric_cols[2]:
+                if st.button("Add Metric") and new_metric.strip():
+                    if stage_edit(plan, ("add_metric", category_idx, new_metric, new_description)):
+                        st.rerun()
+        
+        # Preview and apply staged edits
+        if descriptions:
+            st.subheader("Pending Changes")
+            st.markdown("\n".join(f"{n}. {description}" for n, description in enumerate(descriptions, 1)))
+            st.markdown(f"**Competitors after applying:** {', '.join(name for name, _ in columns)}")
+            st.markdown("**Categories after applying:** " + ", ".join(f"{name} ({len(metrics)} metrics)" for name, metrics in categories))
+            apply_cols = st.columns(2)
+            with apply_cols[0]:
+                if st.button("Apply Changes", type="primary"):
+                    commit_staged_edits()
+                    st.rerun()
+            with apply_cols[1]:
+                if st.button("Discard Changes"):
+                    discard_staged_edits()
                     st.rerun()
-                else:
-                    st.error("Maximum of 10 competitors reached")
         
         # Edit scores
         st.header("Edit Scores")
         
-        for category_idx, category in enumerate(st.session_state.categories):
-            st.subheader(category["name"])
+        for category_idx, (category, rows) in enumerate(metadata.iter_rows(st.session_state.layout)):
+            st.subheader(category.name)
             
-            for metric_idx, metric in enumerate(category["metrics"]):
-                st.markdown(f"**{metric['name']}**")
-                st.markdown(f"<small>{metric['description']}</small>", unsafe_allow_html=True)
+            for metric_idx, (row, metric) in enumerate(rows):
+                scores = st.session_state.score_grid[row]
+                st.markdown(f"**{metric.name}**")
+                st.markdown(f"<small>{metric.description}</small>", unsafe_allow_html=True)
                 
                 score_cols = st.columns(len(st.session_state.competitors))
                 for comp_idx, competitor in enumerate(st.session_state.competitors):
@@ -526,15 +1428,16 @@ def main():
                             "",
                             options=[0, 1, 2, 3, 4, 5],
                             format_func=lambda x: f"{x} - {'World Class' if x==5 else 'Very Good' if x==4 else 'Good' if x==3 else 'Basic' if x==2 else 'None' if x==1 else 'Minimal/None'}",
-                            index=[0, 1, 2, 3, 4, 5].index(metric["scores"][comp_idx]) if comp_idx < len(metric["scores"]) and metric["scores"][comp_idx] in [0, 1, 2, 3, 4, 5] else 1,
+                            index=[0, 1, 2, 3, 4, 5].index(scores[comp_idx]) if comp_idx < len(scores) and scores[comp_idx] in [0, 1, 2, 3, 4, 5] else 1,
                             key=f"score_{category_idx}_{metric_idx}_{comp_idx}"
                         )
                                                 
                         # Update scores
-                        if comp_idx < len(metric["scores"]) and new_score != metric["scores"][comp_idx]:
-                            metric["scores"][comp_idx] = new_score
+                        if comp_idx < len(scores) and new_score != scores[comp_idx]:
+                            scores[comp_idx] = new_score
+                            bump_matrix_version()
                             # Save after updating score
-                            save_data(st.session_state.competitors, st.session_state.categories)
+                            save_data(st.session_state.competitors, st.session_state.layout, st.session_state.score_grid)
         
         # Import/Export functionality
         st.header("Import/Export Data")
@@ -545,131 +1448,15 @@ def main():
             if st.button("Reset to Default"):
                 if st.session_state.get('confirm_reset', False):
                     # Reset to default data
-                    st.session_state.competitors = [
-                        {"name": "SiteOne.com", "score": 44},
-                        {"name": "Grainger", "score": 50},
-                        {"name": "Home Depot", "score": 77},
-                        {"name": "PlantingTree.com", "score": 62},
-                        {"name": "Fastenal", "score": 34},
-                        {"name": "Heritage", "score": 33}
-                    ]
-                    
-                    # Reset categories with 0-5 scale
-                    st.session_state.categories = [
-                        {
-                            "name": "Site Navigation",
-                            "metrics": [
-                                {
-                                    "name": "Taxonomy Menu: Mega Menu",
-                                    "description": "Expandable navigation showing full product hierarchy and category breadth",
-                                    "scores": [4, 4, 4, 3, 3, 3]
-                                },
-                                {
-                                    "name": "Faceted Navigation",
-                                    "description": "Filter system using product attributes for refinement",
-                                    "scores": [3, 4, 4, 4, 3, 4]
-                                }
-                            ]
-                        },
-                        {
-                            "name": "Product List Page",
-                            "metrics": [
-                                {
-                                    "name": "Product Descriptions",
-                                    "description": "Structured naming with brand, model, and key specifications",
-                                    "scores": [3, 3, 4, 3, 2, 3]
-                                },
-                                {
-                                    "name": "Thumbnail Images",
-                                    "description": "Quality and consistency of list view images",
-                                    "scores": [3, 3, 4, 4, 2, 3]
-                                }
-                            ]
-                        },
-                        {
-                            "name": "Product Detail Images",
-                            "metrics": [
-                                {
-                                    "name": "Primary Image",
-                                    "description": "Presence and quality of main product image",
-                                    "scores": [4, 4, 4, 4, 3, 3]
-                                },
-                                {
-                                    "name": "Multiple Images",
-                                    "description": "Additional product views/angles available",
-                                    "scores": [2, 3, 4, 4, 2, 2]
-                                },
-                                {
-                                    "name": "Rich Content",
-                                    "description": "Interactive rotating product view",
-                                    "scores": [0, 0, 0, 0, 0, 0]
-                                },
-                                {
-                                    "name": "Lifestyle Images",
-                                    "description": "Photos showing product being used/installed",
-                                    "scores": [0, 2, 4, 4, 0, 0]
-                                }
-                            ]
-                        },
-                        {
-                            "name": "Product Media",
-                            "metrics": [
-                                {
-                                    "name": "Product Videos",
-                                    "description": "Video content showing product features/use",
-                                    "scores": [0, 0, 0, 0, 0, 0]
-                                },
-                                {
-                                    "name": "Product PDF Assets",
-                                    "description": "Spec sheets, manuals, installation guides",
-                                    "scores": [3, 2, 4, 3, 2, 1]
-                                }
-                            ]
-                        },
-                        {
-                            "name": "Product Content",
-                            "metrics": [
-                                {
-                                    "name": "Long Description/Feature Bullets",
-                                    "description": "Marketing descriptions and key product features",
-                                    "scores": [3, 2, 4, 4, 3, 2]
-                                },
-                                {
-                                    "name": "Specifications",
-                                    "description": "Technical product attributes and details",
-                                    "scores": [3, 4, 4, 4, 3, 2]
-                                },
-                                {
-                                    "name": "How to?",
-                                    "description": "Where/how to use the product",
-                                    "scores": [3, 2, 4, 4, 2, 1]
-                                },
-                                {
-                                    "name": "Product Recommendations/Substitutions",
-                                    "description": "Compatible products, replacement parts",
-                                    "scores": [3, 3, 4, 3, 2, 2]
-                                },
-                                {
-                                    "name": "Customer Reviews & Q&A",
-                                    "description": "Customer feedback and questions with answers",
-                                    "scores": [2, 3, 4, 3, 1, 0]
-                                },
-                                {
-                                    "name": "Projects/Inspirational/Collections",
-                                    "description": "Project ideas and inspirational content",
-                                    "scores": [1, 2, 4, 3, 0, 0]
-                                },
-                                {
-                                    "name": "Base/Variant – SUPER SKU",
-                                    "description": "Product variants and super SKU structure",
-                                    "scores": [2, 3, 4, 2, 2, 1]
-                                }
-                            ]
-                        }
-                    ]
+                    competitors, layout, score_grid = metadata.default_matrix()
+                    st.session_state.competitors = competitors
+                    st.session_state.layout = layout
+                    st.session_state.score_grid = score_grid
+                    discard_staged_edits()
+                    bump_matrix_version()
                     
                     # Save the reset data
-                    save_data(st.session_state.competitors, st.session_state.categories)
+                    save_data(st.session_state.competitors, st.session_state.layout, st.session_state.score_grid)
                     
                     st.session_state['confirm_reset'] = False
                     st.rerun()
@@ -680,7 +1467,7 @@ def main():
         with col2:
             export_data = {
                 "competitors": st.session_state.competitors,
-                "categories": st.session_state.categories
+                "categories": metadata.to_categories(st.session_state.layout, st.session_state.score_grid)
             }
             st.markdown(get_download_link(export_data, "matrix-data.json", "Export Data"), unsafe_allow_html=True)
         
@@ -692,10 +1479,14 @@ def main():
                     data = json.loads(content)
                     
                     if "competitors" in data and "categories" in data:
-                        st.session_state.competitors = data["competitors"]
-                        st.session_state.categories = data["categories"]
+                        layout, score_grid = metadata.intern_categories(data["categories"])
+                        st.session_state.competitors = ensure_competitor_ids(data["competitors"])
+                        st.session_state.layout = layout
+                        st.session_state.score_grid = score_grid
+                        discard_staged_edits()
+                        bump_matrix_version()
                         # Save the imported data
-                        save_data(st.session_state.competitors, st.session_state.categories)
+                        save_data(st.session_state.competitors, st.session_state.layout, st.session_state.score_grid)
                         
                         st.success("Data imported successfully!")
                         st.rerun()
@@ -704,56 +1495,137 @@ def main():
                 except Exception as e:
                     st.error(f"Error parsing file: {str(e)}")
                     
+        # Static report for sharing without a live session
+        st.header("Share Report")
+        if st.button("Generate HTML Report"):
+            report_path = get_report(st.session_state.competitors, st.session_state.layout, st.session_state.score_grid, APP_REPORT_DIR, keep=REPORT_CACHE_SIZE)
+            st.session_state.report = (st.session_state.matrix_version, report_path)
+        report = st.session_state.get('report')
+        if report and report[0] == st.session_state.matrix_version:
+            try:
+                with open(report[1], 'rb') as f:
+                    report_bytes = f.read()
+            except FileNotFoundError:
+                # Pruned by another session; the button renders it again
+                st.session_state.report = None
+            else:
+                st.download_button("Download HTML Report", report_bytes, file_name="matrix-report.html", mime="text/html")
+        
         # Visualization options
         st.header("Visualization Options")
         if st.button("Generate Radar Chart"):
             # Create radar chart of competitor scores by category
-            categories_df = []
-            
-            for category in st.session_state.categories:
-                category_name = category["name"]
-                for comp_idx, competitor in enumerate(st.session_state.competitors):
-                    comp_name = competitor["name"]
-                    
-                    # Calculate average score for this category
-                    cat_scores = [m["scores"][comp_idx] for m in category["metrics"]]
-                    avg_score = sum(cat_scores) / len(cat_scores) if cat_scores else 0
-                    
-                    categories_df.append({
-                        "Category": category_name,
-                        "Competitor": comp_name,
-                        "Score": round(avg_score, 1)
-                    })
+            fig = radar_chart(st.session_state.competitors, st.session_state.layout, st.session_state.score_grid)
             
-            cat_df = pd.DataFrame(categories_df)
-            
- # Create radar chart using Plotly
-            fig = go.Figure()
-            
-            categories = cat_df["Category"].unique()
-            
-            for competitor in cat_df["Competitor"].unique():
-                comp_data = cat_df[cat_df["Competitor"] == competitor]
-                
-                fig.add_trace(go.Scatterpolar(
-                    r=comp_data["Score"].values,
-                    theta=comp_data["Category"].values,
-                    fill='toself',
-                    name=competitor
-                ))
+            st.plotly_chart(fig, use_container_width=True)
+
+    with tab3:
+        analytics = get_analytics()
+        comp_names = analytics["competitors"]
+        
+        if not comp_names or not analytics["metrics"]:
+            st.info("Add competitors and metrics to see analytics.")
+        else:
+            # Pairwise gaps
+            st.header("Competitive Gaps")
+            gap_options = ["Total Score"] + analytics["categories"]
+            gap_view = st.selectbox("Gap matrix for", gap_options, key="analytics_gap_view")
+            if gap_view == "Total Score":
+                gaps = analytics["totals"][:, None] - analytics["totals"][None, :]
+            else:
+                cat_avgs = analytics["category_averages"][analytics["categories"].index(gap_view)]
+                gaps = cat_avgs[:, None] - cat_avgs[None, :]
+            st.plotly_chart(heatmap_figure(np.round(gaps, 2), comp_names, f"{gap_view}: row minus column"), use_container_width=True)
+        
+            # Best and worst categories
+            st.header("Strongest and Weakest Categories")
+            st.dataframe(analytics["extremes"].round(2), use_container_width=True, hide_index=True)
+        
+            # Metrics where the focus competitor trails the leader
+            st.header("Biggest Gaps to the Leader")
+            focus_cols = st.columns([3, 1])
+            with focus_cols[0]:
+                focus = st.selectbox("Competitor", range(len(comp_names)), format_func=lambda i: comp_names[i], key="analytics_focus")
+            with focus_cols[1]:
+                top_k = st.number_input("Top", min_value=1, max_value=len(analytics["metrics"]), value=min(10, len(analytics["metrics"])), key="analytics_top_k")
+            focus_scores = score_column(st.session_state.score_grid, focus)
+            gaps = np.nan_to_num(analytics["leader"] - focus_scores, nan=-np.inf)
+            top = np.argsort(-gaps, kind="stable")[:top_k]
+            top = top[gaps[top] > 0]
+            if len(top):
+                st.dataframe(pd.DataFrame({
+                    "Category": [analytics["metrics"][i][0] for i in top],
+                    "Metric": [analytics["metrics"][i][1] for i in top],
+                    "Score": focus_scores[top],
+                    "Leader": [comp_names[j] for j in analytics["leader_idx"][top]],
+                    "Leader Score": analytics["leader"][top],
+                    "Gap": gaps[top],
+                }), use_container_width=True, hide_index=True)
+            else:
+                st.success(f"{comp_names[focus]} leads or ties on every metric.")
+        
+            # Similarity clustering
+            st.header("Competitor Similarity")
+            n_clusters = st.slider("Clusters", min_value=1, max_value=max(2, min(10, len(comp_names))), value=min(3, len(comp_names)), key="analytics_clusters")
+            if n_clusters not in analytics["clusters"]:
+                analytics["clusters"][n_clusters] = cluster_competitors(analytics["profiles"], n_clusters)
+            labels = analytics["clusters"][n_clusters]
+            order = np.argsort(labels, kind="stable")
+            st.dataframe(pd.DataFrame({
+                "Cluster": labels[order] + 1,
+                "Competitor": [comp_names[i] for i in order],
+                "Total": analytics["totals"][order],
+            }), use_container_width=True, hide_index=True)
+            similarity = analytics["similarity"][np.ix_(order, order)]
+            st.plotly_chart(heatmap_figure(np.round(similarity, 2), [comp_names[i] for i in order], "Score profile similarity (cosine)", colorscale="Blues", zmid=None), use_container_width=True)
+
+    with tab4:
+        trend_store = get_trend_store()
+        
+        # Record the current matrix as a dated snapshot
+        st.header("Record Snapshot")
+        snapshot_cols = st.columns([3, 1])
+        with snapshot_cols[0]:
+            snapshot_date = st.date_input("Snapshot date", key="trend_date")
+        with snapshot_cols[1]:
+            if st.button("Record Snapshot"):
+                if trend_store.record(snapshot_date, st.session_state.competitors, st.session_state.layout, st.session_state.score_grid):
+                    st.success(f"Snapshot recorded for {snapshot_date}")
+        
+        # Query one published snapshot set for the whole view
+        trends = trend_store.data
+        if not len(trends.dates):
+            st.info("Record a snapshot to start tracking trends.")
+        else:
+            st.caption("Competitors keep their history when renamed or moved; a removed and re-added competitor starts a new series, as does a renamed category or metric.")
+            trend_names = trends.competitors.tolist()
+            totals = trends.totals()
             
-            fig.update_layout(
-                polar=dict(
-                    radialaxis=dict(
-                        visible=True,
-                        range=[0, 5]
-                    )
-                ),
-                title="Category Performance by Competitor",
-                showlegend=True
-            )
+            st.header("Total Score Trend")
+            st.plotly_chart(trend_figure(trends.dates, totals, trend_names, "Total score by snapshot"), use_container_width=True)
             
-            st.plotly_chart(fig, use_container_width=True)
+            st.header("Category Average Trend")
+            trend_category = st.selectbox("Category", trends.categories(), key="trend_category")
+            if trend_category is not None:
+                averages = trends.category_averages(trend_category)
+                st.plotly_chart(trend_figure(trends.dates, averages, trend_names, f"{trend_category} average by snapshot"), use_container_width=True)
             
+            # Who improved most between snapshots
+            st.header("Biggest Movers")
+            if len(trends.dates) < 2:
+                st.info("Record at least two snapshots to compare them.")
+            else:
+                lag = st.number_input("Compare with snapshots back", min_value=1, max_value=len(trends.dates) - 1, value=1, key="trend_lag")
+                changes = trends.deltas(totals, lag)[-1]
+                order = np.argsort(-np.nan_to_num(changes, nan=-np.inf), kind="stable")
+                st.dataframe(pd.DataFrame({
+                    "Competitor": [trend_names[i] for i in order],
+                    f"Total ({trends.dates[-1 - lag]})": totals[-1 - lag, order],
+                    f"Total ({trends.dates[-1]})": totals[-1, order],
+                    "Change": changes[order],
+                }), use_container_width=True, hide_index=True)
+
 if __name__ == "__main__":
+    if not st.runtime.exists() and sys.argv[1:2] == ["report"]:
+        sys.exit(report_cli(sys.argv[2:]))
     main()
\ No newline at end of file
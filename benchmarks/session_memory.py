@@ -0,0 +1,95 @@
+"""Measure memory retained per session for the matrix data.
+
+Compares the old per-session representation (category/metric dicts loaded
+from the saved pickle) with the shared metadata table plus a per-session
+score grid, then checks that the table releases records once no session
+uses them.
+
+Run from the repository root:
+
+    python benchmarks/session_memory.py
+"""
+import gc
+import os
+import pickle
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402  (runs in Streamlit bare mode)
+
+SESSIONS = 20
+SIZES = [(6, None), (10, 200), (10, 1000), (25, 2000)]
+
+
+# Saved matrix with n_competitors x n_metrics scores, ten metrics per category
+def matrix_blob(n_competitors, n_metrics, tag=""):
+    categories = []
+    for c in range(n_metrics // 10):
+        categories.append({
+            "name": f"Category {c}{tag}",
+            "metrics": [
+                {
+                    "name": f"Metric {c}-{m} name{tag}",
+                    "description": f"Description of metric {c}-{m}: how well the site presents it to shoppers",
+                    "scores": [(c + m + k) % 6 for k in range(n_competitors)]
+                }
+                for m in range(10)
+            ]
+        })
+    competitors = [{"name": f"Competitor {k}", "score": 0} for k in range(n_competitors)]
+    return pickle.dumps({"competitors": competitors, "categories": categories})
+
+
+def default_blob(table):
+    competitors, layout, grid = table.default_matrix()
+    return pickle.dumps({"competitors": competitors, "categories": table.to_categories(layout, grid)})
+
+
+# Average bytes still allocated per session after loading SESSIONS sessions
+def retained_per_session(load, blob):
+    gc.collect()
+    tracemalloc.start()
+    sessions = [load(blob) for _ in range(SESSIONS)]
+    gc.collect()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del sessions
+    return current / SESSIONS
+
+
+def main():
+    table = app.MetadataTable()
+
+    def load_dicts(blob):
+        data = pickle.loads(blob)
+        return data["competitors"], data["categories"]
+
+    def load_shared(blob):
+        data = pickle.loads(blob)
+        layout, grid = table.intern_categories(data["categories"])
+        return data["competitors"], layout, grid
+
+    print("Retained memory per session")
+    for n_competitors, n_metrics in SIZES:
+        blob = default_blob(table) if n_metrics is None else matrix_blob(n_competitors, n_metrics)
+        keep = load_shared(blob)  # metadata shared with other sessions stays interned
+        before = retained_per_session(load_dicts, blob)
+        after = retained_per_session(load_shared, blob)
+        label = "default" if n_metrics is None else n_metrics
+        print(f"  {n_competitors:>3} competitors x {label:>7} metrics: "
+              f"{before / 1024:8.1f} KiB -> {after / 1024:8.1f} KiB ({100 * (1 - after / before):.0f}% less)")
+        del keep
+
+    gc.collect()
+    baseline = len(table)
+    sessions = [load_shared(matrix_blob(10, 200, tag=f" #{i}")) for i in range(50)]
+    grown = len(table)
+    del sessions
+    gc.collect()
+    print(f"Metadata records: {baseline} -> {grown} with 50 distinct imports -> {len(table)} after they are dropped")
+
+
+if __name__ == "__main__":
+    main()